@@ -1,23 +1,46 @@
 #!/usr/bin/env python3
 import os
 import sys
+import io
 import json
 import time
 from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Any, Optional
-import subprocess
-import concurrent.futures
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 from infer_analyzer import InferAnalyzer
+from method_extractor import read_source
+from bisect import bisect_right
 import shutil
 import re
+import hashlib
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 모듈 사용
+    orjson = None
 
 class BatchInferAnalyzer:
+    # Java 버전 감지용 정규식 (Gradle의 source/targetCompatibility와 Maven의 maven.compiler.source/target을 한 번에 검색)
+    _RE_JAVA_VERSION = re.compile(
+        rb'(?:source|target)Compatibility\s*=\s*[\'"]?(\d+)'
+        rb'|<maven\.compiler\.(?:source|target)>(\d+)</maven\.compiler\.(?:source|target)>'
+    )
+    # 버전 설정은 대부분 빌드 파일 앞부분에 있으므로 먼저 이만큼만 읽음
+    _BUILD_FILE_HEAD_SIZE = 16384
+    # 빌드 실패 시 오류 메시지에 포함할 로그 끝부분 크기
+    LOG_TAIL_SIZE = 8192
+    # Gradle wrapper가 사용하는 배포판 URL (gradle/wrapper/gradle-wrapper.properties)
+    _RE_GRADLE_DISTRIBUTION = re.compile(rb'^\s*distributionUrl\s*[=:]\s*(\S+)', re.MULTILINE)
+    # ./gradlew --stop 하나를 기다리는 최대 시간 (초)
+    GRADLE_STOP_TIMEOUT = 60
+
     def __init__(self, max_workers: int = 2):
-        self.GREEN = '\033[92m'
-        self.RED = '\033[91m'
-        self.YELLOW = '\033[93m'
-        self.NC = '\033[0m'  # No Color
+        # 색상 코드 (터미널이 아닌 파일 등으로 출력할 때는 사용하지 않음)
+        use_color = sys.stdout.isatty()
+        self.GREEN = '\033[92m' if use_color else ''
+        self.RED = '\033[91m' if use_color else ''
+        self.YELLOW = '\033[93m' if use_color else ''
+        self.NC = '\033[0m' if use_color else ''  # No Color
         
         self.max_workers = max_workers
         self.log_dir = os.path.join(os.getcwd(), "logs")
@@ -28,167 +51,188 @@ class BatchInferAnalyzer:
         # 결과 저장을 위한 파일
         self.summary_file = os.path.join(self.results_dir, f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
         
+        # 프로젝트 디렉토리별 파일 목록 캐시 (반복적인 os.path.exists 호출 방지)
+        self._dir_files: Dict[str, frozenset] = {}
+        
+        # Gradle 데몬을 사용한 프로젝트 (프로젝트 경로 -> 빌드 환경), 분석이 끝나면 데몬 종료
+        self._gradle_projects: Dict[str, Dict[str, str]] = {}
+        
+        # 이미 분석한 프로젝트 캐시 (프로젝트 경로 -> 지문, 분석 결과), 재실행 시 변경되지 않은 프로젝트는 건너뜀
+        self.cache_file = os.path.join(self.results_dir, "cache.json")
+        self._cache = self._load_cache()
+        
     def find_java_projects(self, directory: str) -> List[str]:
         """Java 프로젝트 디렉토리 찾기"""
         java_projects = []
-        try:
-            # 기준 디렉토리의 절대 경로
-            base_dir = os.path.abspath(directory)
-            
-            # 이미 처리된 경로를 추적
-            processed_paths = set()
-            
-            for root, dirs, files in os.walk(directory):
-                # Android 프로젝트 제외
-                if "android" in root.lower():
-                    continue
-                    
-                # build.gradle 또는 pom.xml이 있는 디렉토리 찾기
-                if "build.gradle" in files or "pom.xml" in files:
-                    abs_path = os.path.abspath(root)
-                    
-                    # 이미 처리된 경로의 하위 디렉토리인지 확인
-                    if any(abs_path.startswith(p) for p in processed_paths):
-                        continue
-                        
-                    # 최상위 프로젝트 디렉토리 찾기
-                    current_dir = root
-                    while current_dir != base_dir:
-                        parent_dir = os.path.dirname(current_dir)
-                        if os.path.exists(os.path.join(parent_dir, "build.gradle")) or \
-                           os.path.exists(os.path.join(parent_dir, "pom.xml")):
-                            current_dir = parent_dir
+
+        def _scan(path: str) -> None:
+            subdirs = []
+            files = []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Android 프로젝트, 숨김 디렉토리(.git 등), node_modules 제외
+                            name = entry.name
+                            if name.startswith(".") or name == "node_modules" or "android" in name.lower():
+                                continue
+                            subdirs.append(entry.path)
                         else:
-                            break
-                    
-                    abs_path = os.path.abspath(current_dir)
-                    if abs_path not in processed_paths:
-                        java_projects.append(abs_path)
-                        processed_paths.add(abs_path)
-                        print(f"프로젝트 발견: {abs_path}")
-                        
+                            files.append(entry.name)
+            except OSError:
+                # 접근할 수 없는 디렉토리는 건너뜀
+                return
+
+            # build.gradle 또는 pom.xml이 있으면 최상위 프로젝트로 기록하고 하위 디렉토리는 탐색하지 않음
+            names = frozenset(files)
+            if "build.gradle" in names or "pom.xml" in names:
+                self._dir_files[path] = names
+                java_projects.append(path)
+                print(f"프로젝트 발견: {path}")
+                return
+
+            for subdir in subdirs:
+                _scan(subdir)
+
+        try:
+            _scan(os.path.abspath(directory))
         except Exception as e:
             print(f"프로젝트 검색 중 오류 발생: {str(e)}")
         return java_projects
         
+    def _has_file(self, project_path: str, name: str) -> bool:
+        """프로젝트 디렉토리에 파일이 있는지 캐시된 목록으로 확인합니다."""
+        names = self._dir_files.get(project_path)
+        if names is None:
+            return os.path.exists(os.path.join(project_path, name))
+        return name in names
+
     def get_method_code(self, file_path: str, method_name: str, line_number: int) -> str:
         """메서드의 실제 코드를 추출합니다."""
         try:
-            if not os.path.exists(file_path):
+            # 소스 캐시는 infer_analyzer, generate_bug_report와 같은 method_extractor.read_source를 사용
+            try:
+                text, line_starts, balances = read_source(file_path)
+            except FileNotFoundError:
                 return "파일을 찾을 수 없습니다."
                 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
             # 메서드 시작과 끝을 찾기 위한 변수
             start_line = max(0, line_number - 1)  # 0-based index
-            end_line = min(len(lines), line_number + 20)  # 최대 20줄까지
-            method_code = []
-            brace_count = 0
-            found_method = False
+            end_line = min(len(balances), line_number + 20)  # 최대 20줄까지
             
-            # 메서드 시작 부분 찾기
-            for i in range(start_line, -1, -1):
-                if method_name in lines[i]:
-                    start_line = i
-                    found_method = True
-                    break
-                    
-            if not found_method:
+            # 메서드 시작 부분 찾기: start_line 줄(줄바꿈 제외)까지의 본문에서 메서드 이름이 마지막으로 나온 위치의 줄
+            found_at = text.rfind(method_name, 0, line_starts[start_line + 1] - 1)
+            if found_at == -1:
                 return "메서드를 찾을 수 없습니다."
+            start_line = bisect_right(line_starts, found_at) - 1
                 
-            # 메서드 코드 추출
-            for i in range(start_line, end_line):
-                line = lines[i]
-                method_code.append(line)
-                
-                # 중괄호 카운트로 메서드 범위 파악
-                brace_count += line.count('{') - line.count('}')
-                if brace_count == 0 and i > start_line:
-                    break
+            # 메서드 코드 추출 (중괄호 누적 합이 선언 직전 값으로 돌아오는 줄까지를 메서드 범위로 봄)
+            base = balances[start_line - 1] if start_line else 0
+            try:
+                method_end = balances.index(base, start_line + 1, end_line) + 1
+            except ValueError:  # 범위 안에서 닫히지 않으면 범위 끝까지
+                method_end = end_line
                     
-            return ''.join(method_code)
+            return text[line_starts[start_line]:line_starts[method_end]]
             
         except Exception as e:
             return f"코드 추출 중 오류 발생: {str(e)}"
 
-    def analyze_project(self, project_path: str) -> Dict[str, str]:
+    async def _run_command(self, cmd: List[str], project_path: str, env: Dict[str, str], log) -> Tuple[int, str]:
+        """명령어를 실행하고 출력은 로그 파일에 바로 기록합니다. 실패 시 로그의 마지막 부분을 함께 반환합니다."""
+        # preexec_fn이나 user/group/extra_groups 인자를 쓰지 않아야 CPython이 fork 대신 vfork로 프로세스를 생성함
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=project_path,
+            env=env,
+            stdout=log,
+            stderr=asyncio.subprocess.STDOUT
+        )
+        returncode = await process.wait()
+        if returncode == 0:
+            return returncode, ""
+        
+        # 전체 빌드 로그 대신 마지막 부분만 읽어서 오류 메시지로 사용
+        log.flush()
+        with open(log.name, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - self.LOG_TAIL_SIZE))
+            return returncode, f.read().decode('utf-8', 'replace')
+
+    async def analyze_project(self, project_path: str, java_version: Optional[str] = None) -> Dict[str, str]:
         """프로젝트 분석"""
         try:
             print(f"\n프로젝트 분석 시작: {project_path}")
             
-            # Java 버전 감지
-            java_version = self.detect_java_version(project_path)
+            # Java 버전 감지 (run_analysis에서 이미 감지한 경우 재사용)
+            if java_version is None:
+                java_version = self.detect_java_version(project_path)
             print(f"감지된 Java 버전: {java_version}")
             
-            # Java 환경 설정
+            # Java 환경 설정 (프로세스 전역 os.environ은 변경하지 않음)
             env = os.environ.copy()
             java_home = f"/usr/lib/jvm/java-{java_version}-openjdk-amd64"
             env["JAVA_HOME"] = java_home
             env["PATH"] = f"{java_home}/bin:{env['PATH']}"
             
-            # Gradle 프로젝트 분석
-            if os.path.exists(os.path.join(project_path, "gradlew")):
-                print("Gradle 프로젝트 분석 시작...")
-                gradle_cmd = ["infer", "run", "--", "./gradlew", "clean", "build", "--no-daemon", "-DskipTests"]
-                process = subprocess.run(
-                    gradle_cmd,
-                    cwd=project_path,
-                    env=env,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                
-                if process.returncode != 0:
-                    return {
-                        "project": project_path,
-                        "status": "error",
-                        "error": f"Gradle 빌드/분석 실패. 로그: {process.stderr}"
-                    }
-                
-                print("Gradle 프로젝트 분석 완료")
-            
-            # Maven 프로젝트 분석
-            if os.path.exists(os.path.join(project_path, "pom.xml")):
-                print(f"Running Maven analysis for {project_path}...")
-                try:
-                    # Run Maven build with Infer
-                    maven_cmd = ["infer", "run", "--", "mvn", "clean", "compile", "-DskipTests"]
-                    result = subprocess.run(maven_cmd, 
-                                         env=env,
-                                         cwd=project_path,
-                                         capture_output=True,
-                                         text=True)
+            # 빌드 출력은 메모리에 모으지 않고 프로젝트별 로그 파일에 기록
+            # 디렉토리 이름이 같은 프로젝트가 동시에 돌아도 로그가 섞이지 않도록 전체 경로의 짧은 해시를 붙임
+            path_hash = hashlib.blake2b(os.path.abspath(project_path).encode(), digest_size=4).hexdigest()
+            log_file = os.path.join(self.log_dir, f"{os.path.basename(project_path)}-{path_hash}.log")
+            with open(log_file, "wb") as log:
+                # Gradle 프로젝트 분석
+                if self._has_file(project_path, "gradlew"):
+                    print("Gradle 프로젝트 분석 시작...")
+                    # 데몬을 유지해서 다음 프로젝트 빌드 때 JVM 시작 비용을 줄임
+                    gradle_cmd = ["infer", "run", "--", "./gradlew", "clean", "build", "-DskipTests"]
+                    self._gradle_projects[project_path] = env
+                    returncode, error_log = await self._run_command(gradle_cmd, project_path, env, log)
                     
-                    if result.returncode != 0:
-                        print(f"Error during Maven analysis: {result.stderr}")
+                    if returncode != 0:
                         return {
                             "project": project_path,
                             "status": "error",
-                            "error": f"Maven 빌드/분석 실패. 로그: {result.stderr}"
+                            "error": f"Gradle 빌드/분석 실패. 로그: {error_log}"
                         }
-                        
-                    print(f"Maven analysis completed for {project_path}")
-                    return {
-                        "project": project_path,
-                        "status": "success",
-                        "error": None
-                    }
                     
-                except Exception as e:
-                    print(f"Error during Maven analysis: {str(e)}")
+                    print("Gradle 프로젝트 분석 완료")
+                
+                # Maven 프로젝트 분석
+                if self._has_file(project_path, "pom.xml"):
+                    print(f"Running Maven analysis for {project_path}...")
+                    try:
+                        # Run Maven build with Infer
+                        maven_cmd = ["infer", "run", "--", "mvn", "clean", "compile", "-DskipTests"]
+                        returncode, error_log = await self._run_command(maven_cmd, project_path, env, log)
+                        
+                        if returncode != 0:
+                            print(f"Error during Maven analysis: {error_log}")
+                            return {
+                                "project": project_path,
+                                "status": "error",
+                                "error": f"Maven 빌드/분석 실패. 로그: {error_log}"
+                            }
+                            
+                        print(f"Maven analysis completed for {project_path}")
+                        return {
+                            "project": project_path,
+                            "status": "success",
+                            "error": None
+                        }
+                        
+                    except Exception as e:
+                        print(f"Error during Maven analysis: {str(e)}")
+                        return {
+                            "project": project_path,
+                            "status": "error",
+                            "error": str(e)
+                        }
+                else:
                     return {
                         "project": project_path,
                         "status": "error",
-                        "error": str(e)
+                        "error": "빌드 파일을 찾을 수 없습니다."
                     }
-            else:
-                return {
-                    "project": project_path,
-                    "status": "error",
-                    "error": "빌드 파일을 찾을 수 없습니다."
-                }
             
             return {
                 "project": project_path,
@@ -203,38 +247,34 @@ class BatchInferAnalyzer:
                 "error": str(e)
             }
 
+    def _search_build_file(self, file_path: str) -> Optional[str]:
+        """빌드 파일 앞부분에서 먼저 버전을 찾고, 없을 때만 나머지를 읽어 다시 찾습니다."""
+        with open(file_path, 'rb') as f:
+            content = f.read(self._BUILD_FILE_HEAD_SIZE)
+            match = self._RE_JAVA_VERSION.search(content)
+            if not match:
+                rest = f.read()
+                if not rest:
+                    return None
+                match = self._RE_JAVA_VERSION.search(content + rest)
+                if not match:
+                    return None
+        return (match.group(1) or match.group(2)).decode()
+
     def detect_java_version(self, project_path: str) -> Optional[str]:
         """프로젝트의 Java 버전 요구사항을 확인합니다."""
         try:
-            # build.gradle 파일 확인
-            gradle_file = os.path.join(project_path, "build.gradle")
-            if os.path.exists(gradle_file):
-                with open(gradle_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # sourceCompatibility 또는 targetCompatibility 확인
-                    if 'sourceCompatibility' in content:
-                        match = re.search(r'sourceCompatibility\s*=\s*[\'"]?(\d+)[\'"]?', content)
-                        if match:
-                            return match.group(1)
-                    if 'targetCompatibility' in content:
-                        match = re.search(r'targetCompatibility\s*=\s*[\'"]?(\d+)[\'"]?', content)
-                        if match:
-                            return match.group(1)
+            # build.gradle 파일 확인 (sourceCompatibility 또는 targetCompatibility)
+            if self._has_file(project_path, "build.gradle"):
+                version = self._search_build_file(os.path.join(project_path, "build.gradle"))
+                if version:
+                    return version
 
-            # pom.xml 파일 확인
-            pom_file = os.path.join(project_path, "pom.xml")
-            if os.path.exists(pom_file):
-                with open(pom_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    # maven.compiler.source 또는 maven.compiler.target 확인
-                    if 'maven.compiler.source' in content:
-                        match = re.search(r'<maven\.compiler\.source>(\d+)</maven\.compiler\.source>', content)
-                        if match:
-                            return match.group(1)
-                    if 'maven.compiler.target' in content:
-                        match = re.search(r'<maven\.compiler\.target>(\d+)</maven\.compiler\.target>', content)
-                        if match:
-                            return match.group(1)
+            # pom.xml 파일 확인 (maven.compiler.source 또는 maven.compiler.target)
+            if self._has_file(project_path, "pom.xml"):
+                version = self._search_build_file(os.path.join(project_path, "pom.xml"))
+                if version:
+                    return version
 
             # 기본값으로 Java 21 반환
             return "21"
@@ -242,19 +282,24 @@ class BatchInferAnalyzer:
             print(f"Java 버전 확인 중 오류 발생: {str(e)}")
             return "21"  # 오류 발생 시 기본값으로 Java 21 반환
 
+    def _write_json(self, file_path: str, data: Any) -> None:
+        """JSON 파일을 저장합니다. orjson이 설치되어 있으면 더 빠른 orjson을 사용합니다."""
+        if orjson is not None:
+            with open(file_path, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            # 메모리에서 한 번에 직렬화·UTF-8 인코딩한 뒤 바이너리로 한 번에 기록
+            encoded = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+            with open(file_path, "wb") as f:
+                f.write(encoded)
+
     def save_summary(self, results: List[Dict]) -> str:
         """분석 결과를 요약하여 저장합니다."""
+        # 결과 디렉토리와 파일명은 __init__에서 한 번만 정함
+        summary_file = self.summary_file
         try:
-            # 결과 디렉토리 생성
-            os.makedirs("infer-results", exist_ok=True)
-            
-            # 타임스탬프로 파일명 생성
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            summary_file = f"infer-results/batch_summary_{timestamp}.json"
-            
             # 결과 저장
-            with open(summary_file, "w", encoding="utf-8") as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            self._write_json(summary_file, results)
                 
             print(f"\n{self.GREEN}분석 결과가 저장되었습니다: {summary_file}{self.NC}")
             return summary_file
@@ -263,9 +308,8 @@ class BatchInferAnalyzer:
             print(f"{self.RED}결과 저장 중 오류가 발생했습니다: {e}{self.NC}")
             # 임시 파일로 저장 시도
             try:
-                temp_file = f"batch_summary_{timestamp}.json"
-                with open(temp_file, "w", encoding="utf-8") as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False)
+                temp_file = os.path.basename(summary_file)
+                self._write_json(temp_file, results)
                 print(f"{self.YELLOW}결과가 현재 디렉토리에 저장되었습니다: {temp_file}{self.NC}")
                 return temp_file
             except Exception as e2:
@@ -274,43 +318,215 @@ class BatchInferAnalyzer:
     
     def print_summary(self, results: List[Dict]) -> None:
         """분석 결과를 출력합니다."""
-        print("\n=== 분석 결과 요약 ===")
+        # 줄마다 print하지 않고 버퍼에 모아 한 번에 출력
+        buf = io.StringIO()
+        buf.write("\n=== 분석 결과 요약 ===\n")
         
         total_projects = len(results)
         successful = sum(1 for r in results if r["status"] == "success")
         failed = total_projects - successful
         
-        print(f"\n총 프로젝트 수: {total_projects}")
-        print(f"성공: {successful}")
-        print(f"실패: {failed}")
+        buf.write(f"\n총 프로젝트 수: {total_projects}\n")
+        buf.write(f"성공: {successful}\n")
+        buf.write(f"실패: {failed}\n")
         
-        print("\n=== 상세 결과 ===")
+        buf.write("\n=== 상세 결과 ===\n")
         for result in results:
-            print(f"\n프로젝트: {result['project']}")
-            print(f"상태: {result['status']}")
+            buf.write(f"\n프로젝트: {result['project']}\n")
+            buf.write(f"상태: {result['status']}\n")
             
             if result["status"] == "success":
                 issues = result["issues"]
-                print(f"발견된 문제 수: {len(issues)}")
+                buf.write(f"발견된 문제 수: {len(issues)}\n")
                 
                 if issues:
-                    print("\n문제 상세:")
+                    buf.write("\n문제 상세:\n")
                     for issue in issues:
-                        print(f"\n문제 유형: {issue.get('bug_type', '알 수 없음')}")
-                        print(f"파일: {issue.get('file', '알 수 없음')}")
-                        print(f"라인: {issue.get('line', 0)}")
-                        print(f"메서드: {issue.get('procedure', '알 수 없음')}")
-                        print(f"설명: {issue.get('description', '설명 없음')}")
+                        buf.write(f"\n문제 유형: {issue.get('bug_type', '알 수 없음')}\n")
+                        buf.write(f"파일: {issue.get('file', '알 수 없음')}\n")
+                        buf.write(f"라인: {issue.get('line', 0)}\n")
+                        buf.write(f"메서드: {issue.get('procedure', '알 수 없음')}\n")
+                        buf.write(f"설명: {issue.get('description', '설명 없음')}\n")
                         
                         if 'method_code' in issue:
-                            print("\n관련 코드:")
-                            print("```java")
-                            print(issue['method_code'])
-                            print("```")
-                        print("-" * 80)
+                            buf.write("\n관련 코드:\n")
+                            buf.write("```java\n")
+                            buf.write(f"{issue['method_code']}\n")
+                            buf.write("```\n")
+                        buf.write("-" * 80 + "\n")
             else:
-                print(f"오류: {result.get('error', '알 수 없음')}")
-            print("=" * 80)
+                buf.write(f"오류: {result.get('error', '알 수 없음')}\n")
+            buf.write("=" * 80 + "\n")
+            
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+    
+    def _load_cache(self) -> Dict[str, Dict]:
+        """이전 실행에서 저장한 분석 캐시를 불러옵니다."""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self) -> None:
+        """분석 캐시를 저장합니다."""
+        try:
+            self._write_json(self.cache_file, self._cache)
+        except Exception as e:
+            print(f"{self.YELLOW}경고: 분석 캐시 저장 중 오류 발생: {e}{self.NC}")
+
+    async def _git_output(self, project_path: str, *args: str) -> Optional[bytes]:
+        """프로젝트 디렉토리에서 git 명령을 실행하고 출력을 반환합니다. 실패하면 None을 반환합니다."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git", *args,
+                cwd=project_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            output, _ = await process.communicate()
+        except OSError:
+            return None
+        return output if process.returncode == 0 else None
+
+    async def _project_fingerprint(self, project_path: str) -> Optional[str]:
+        """
+        빌드 파일 내용과 소스 상태로 프로젝트 지문을 계산합니다.
+        git 저장소면 HEAD 커밋과 커밋되지 않은 변경 파일의 크기/수정 시각을, 아니면 src/ 아래 파일들의 크기/수정 시각을 사용합니다.
+        소스 상태를 알 수 없으면 (git 저장소가 아니고 src/도 없으면) None을 반환하며 캐시하지 않습니다.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for name in ("build.gradle", "pom.xml", "gradlew", "settings.gradle"):
+            if self._has_file(project_path, name):
+                digest.update(name.encode())
+                with open(os.path.join(project_path, name), 'rb') as f:
+                    digest.update(f.read())
+                    
+        head = await self._git_output(project_path, "rev-parse", "HEAD")
+        status = await self._git_output(project_path, "status", "--porcelain", "-z", "--untracked-files=all") \
+            if head is not None else None
+        if status is not None:
+            # 커밋되지 않은 변경: 변경된 파일 목록과 각 파일의 크기/수정 시각 (같은 파일을 다시 고쳐도 지문이 바뀜)
+            digest.update(head)
+            digest.update(status)
+            entries = iter(status.split(b'\0'))
+            for entry in entries:
+                if len(entry) <= 3:
+                    continue
+                if b'R' in entry[:2] or b'C' in entry[:2]:
+                    next(entries, None)  # 이름 변경/복사 항목 뒤에는 원래 경로가 상태 코드 없이 따라옴
+                try:
+                    st = os.stat(os.path.join(project_path, os.fsdecode(entry[3:])))
+                except OSError:  # 삭제된 파일
+                    continue
+                digest.update(f"{st.st_size}:{st.st_mtime_ns}".encode())
+        else:
+            # git 저장소가 아니거나 git이 없으면 src/ 아래 파일 수, 전체 크기, 가장 최근 수정 시각으로 판단
+            src_dir = os.path.join(project_path, "src")
+            if not os.path.isdir(src_dir):
+                return None
+            count = total_size = max_mtime = 0
+            for root, _, files in os.walk(src_dir):
+                for name in files:
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    count += 1
+                    total_size += st.st_size
+                    max_mtime = max(max_mtime, st.st_mtime_ns)
+            digest.update(f"{count}:{total_size}:{max_mtime}".encode())
+        return digest.hexdigest()
+
+    async def _analyze_projects(self, projects: List[str], java_version: Optional[str] = None) -> List[Dict]:
+        """최대 max_workers개의 프로젝트를 동시에 분석합니다."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def _run(project: str) -> Dict:
+            async with semaphore:
+                try:
+                    # 지문이 같고 Infer 결과가 남아 있으면 이전 결과를 재사용
+                    fingerprint = await self._project_fingerprint(project)
+                    cached = self._cache.get(project)
+                    if fingerprint is not None and cached and cached.get("fingerprint") == fingerprint and \
+                       os.path.exists(os.path.join(project, "infer-out", "report.json")):
+                        print(f"변경 사항이 없어 이전 분석 결과를 사용합니다: {project}")
+                        return cached["result"]
+                        
+                    result = await self.analyze_project(project, java_version)
+                    if result["status"] == "success" and fingerprint is not None:
+                        self._cache[project] = {"fingerprint": fingerprint, "result": result}
+                    print(f"프로젝트 분석 완료: {project}")
+                    return result
+                except Exception as e:
+                    print(f"프로젝트 분석 중 오류 발생: {project} - {str(e)}")
+                    return {
+                        "project": project,
+                        "status": "error",
+                        "error": str(e)
+                    }
+
+        return await asyncio.gather(*(_run(project) for project in projects))
+    
+    async def _stop_gradle_daemons(self) -> None:
+        """분석 중 띄운 Gradle 데몬을 종료합니다."""
+        # --stop은 같은 Gradle 버전의 데몬을 모두 종료하므로 배포판마다 한 번만 성공하면 됨
+        stopped = set()
+        for project_path, env in self._gradle_projects.items():
+            distribution = self._gradle_distribution(project_path)
+            if distribution in stopped:
+                continue
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "./gradlew", "--stop",
+                    cwd=project_path,
+                    env=env,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                try:
+                    returncode = await asyncio.wait_for(process.wait(), self.GRADLE_STOP_TIMEOUT)
+                except asyncio.TimeoutError:
+                    # 배포판 다운로드 등으로 wrapper가 멈춰도 종료 단계가 끝없이 기다리지 않도록 강제 종료
+                    process.kill()
+                    await process.wait()
+                    print(f"{self.YELLOW}경고: Gradle 데몬 종료 시간 초과: {project_path}{self.NC}")
+                    continue
+                if returncode == 0:
+                    stopped.add(distribution)
+            except OSError as e:
+                print(f"{self.YELLOW}경고: Gradle 데몬 종료 중 오류 발생: {project_path} - {e}{self.NC}")
+        self._gradle_projects.clear()
+
+    def _gradle_distribution(self, project_path: str) -> str:
+        """Gradle wrapper의 배포판 URL을 반환합니다. 알 수 없으면 프로젝트 경로를 대신 사용합니다."""
+        try:
+            with open(os.path.join(project_path, "gradle", "wrapper", "gradle-wrapper.properties"), "rb") as f:
+                match = self._RE_GRADLE_DISTRIBUTION.search(f.read())
+        except OSError:
+            match = None
+        return match.group(1).decode("utf-8", "replace") if match else project_path
+
+    async def _analyze_all(self, projects_by_java_version: Dict[str, List[str]]) -> List[Dict]:
+        """하나의 이벤트 루프에서 Java 버전별로 프로젝트를 분석합니다."""
+        all_results = []
+        try:
+            for java_version, projects in projects_by_java_version.items():
+                print(f"\nJava {java_version} 프로젝트 분석 시작 (총 {len(projects)}개)")
+                
+                # Java 버전 설정
+                java_home = f"/usr/lib/jvm/java-{java_version}-openjdk-amd64"
+                if not os.path.exists(java_home):
+                    print(f"Java {java_version}이 설치되어 있지 않습니다. {java_home} 경로를 확인해주세요.")
+                    continue
+
+                # 해당 Java 버전의 프로젝트들을 병렬로 분석
+                all_results.extend(await self._analyze_projects(projects, java_version))
+        finally:
+            await self._stop_gradle_daemons()
+        return all_results
     
     def run_analysis(self, directory: str) -> None:
         """프로젝트 분석 실행"""
@@ -330,39 +546,10 @@ class BatchInferAnalyzer:
                 projects_by_java_version[java_version].append(project)
 
             # 각 Java 버전별로 분석 실행
-            all_results = []
-            for java_version, projects in projects_by_java_version.items():
-                print(f"\nJava {java_version} 프로젝트 분석 시작 (총 {len(projects)}개)")
-                
-                # Java 버전 설정
-                java_home = f"/usr/lib/jvm/java-{java_version}-openjdk-amd64"
-                if not os.path.exists(java_home):
-                    print(f"Java {java_version}이 설치되어 있지 않습니다. {java_home} 경로를 확인해주세요.")
-                    continue
-                
-                # 환경 변수 설정
-                os.environ["JAVA_HOME"] = java_home
-                os.environ["PATH"] = f"{java_home}/bin:" + os.environ["PATH"]
-                print(f"JAVA_HOME 설정: {java_home}")
-
-                # 해당 Java 버전의 프로젝트들을 병렬로 분석
-                with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    future_to_project = {executor.submit(self.analyze_project, project): project for project in projects}
-                    for future in concurrent.futures.as_completed(future_to_project):
-                        project = future_to_project[future]
-                        try:
-                            result = future.result()
-                            all_results.append(result)
-                            print(f"프로젝트 분석 완료: {project}")
-                        except Exception as e:
-                            print(f"프로젝트 분석 중 오류 발생: {project} - {str(e)}")
-                            all_results.append({
-                                "project": project,
-                                "status": "error",
-                                "error": str(e)
-                            })
+            all_results = asyncio.run(self._analyze_all(projects_by_java_version))
 
             # 결과 저장
+            self._save_cache()
             summary_file = self.save_summary(all_results)
             print(f"\n분석 결과가 저장되었습니다: {summary_file}")
 
@@ -1,9 +1,24 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import json
 import re
-from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard json module
+    orjson = None
+
+def load_json(file_path):
+    """
+    Load a JSON file, using orjson when it is installed
+    """
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def calculate_relative_line(bug_line, method_start_line):
     """
@@ -12,10 +27,11 @@ def calculate_relative_line(bug_line, method_start_line):
     """
     return bug_line - method_start_line + 1  # Add 1 to make it 1-based index
 
-def create_buggyline_location(bug_info, output_dir):
+def create_buggyline_location(bug_info, bug_dir):
     """
     Create buggyline_location.json file with vulnerability location information
     in VJBench-trans format
+    bug_dir is the bug's output directory and must already exist (created by convert_to_codet5)
     """
     # Calculate relative line numbers
     bug_line = bug_info["line_number"]
@@ -41,29 +57,30 @@ def create_buggyline_location(bug_info, output_dir):
         ]
     }
     
-    # Create bug_id directory
-    bug_dir = os.path.join(output_dir, bug_info["bug_id"])
-    os.makedirs(bug_dir, exist_ok=True)
-    
-    # Save to JSON file
-    output_file = os.path.join(bug_dir, "buggyline_location.json")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(location_info, f, indent=4, ensure_ascii=False)
+    # Save to JSON file (serialize and encode in memory first so the file gets a single binary write)
+    output_file = f"{bug_dir}{os.sep}buggyline_location.json"
+    data = json.dumps(location_info, indent=4, ensure_ascii=False).encode('utf-8')
+    with open(output_file, 'wb') as f:
+        f.write(data)
     
     return output_file
 
-def save_original_method(bug_info, output_dir):
+def save_original_method(bug_info, bug_dir):
     """
     Save the original method code to a Java file
+    bug_dir is the bug's output directory and must already exist (created by convert_to_codet5)
     """
-    # Create bug_id directory
-    bug_dir = os.path.join(output_dir, bug_info["bug_id"])
-    os.makedirs(bug_dir, exist_ok=True)
-    
-    # Create Java file with original method
-    output_file = os.path.join(bug_dir, f"{bug_info['bug_id']}_original_method.java")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(bug_info["method_code"])
+    # Create Java file with original method (skip the write if the file already has the same content)
+    output_file = f"{bug_dir}{os.sep}{bug_info['bug_id']}_original_method.java"
+    data = bug_info["method_code"].encode('utf-8')
+    try:
+        with open(output_file, 'rb') as f:
+            if f.read() == data:
+                return output_file
+    except FileNotFoundError:
+        pass
+    with open(output_file, 'wb') as f:
+        f.write(data)
     
     return output_file
 
@@ -71,38 +88,43 @@ def convert_to_codet5(input_file, output_dir):
     """
     Convert bug report to VJBench-trans format files
     """
+    created_files = []
     try:
         # Read input JSON file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            bug_reports = json.load(f)
+        bug_reports = load_json(input_file)
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Process each bug report
+        # Process each bug report ("Created ..." lines are collected and written to stdout in one go)
+        created_dirs = set()
+        out_prefix = os.path.join(output_dir, "")  # output_dir with a trailing separator
         for bug in bug_reports:
-            # Create bug_id directory
-            bug_dir = os.path.join(output_dir, bug["bug_id"])
-            os.makedirs(bug_dir, exist_ok=True)
+            # Create bug_id directory (once per bug_id; the helpers below only write into it)
+            bug_dir = out_prefix + bug["bug_id"]
+            if bug_dir not in created_dirs:
+                os.makedirs(bug_dir, exist_ok=True)
+                created_dirs.add(bug_dir)
             
             # Create buggyline_location.json
-            location_file = create_buggyline_location(bug, output_dir)
-            print(f"Created {location_file}")
+            location_file = create_buggyline_location(bug, bug_dir)
+            created_files.append(f"Created {location_file}\n")
             
             # Save original method
-            method_file = save_original_method(bug, output_dir)
-            print(f"Created {method_file}")
+            method_file = save_original_method(bug, bug_dir)
+            created_files.append(f"Created {method_file}\n")
             
+        sys.stdout.write(''.join(created_files))
         print(f"Successfully converted {len(bug_reports)} bug reports")
         return True
         
     except Exception as e:
+        # Report the files already written before the error, as the per-file output used to
+        sys.stdout.write(''.join(created_files))
         print(f"Error: {str(e)}")
         return False
 
 def main():
-    import sys
-    
     if len(sys.argv) != 3:
         print("Usage: python convert_to_codet5.py <input_json> <output_directory>")
         print("Example: python convert_to_codet5.py bug-reports/all_bugs.json codet5-output")
@@ -3,9 +3,72 @@
 import json
 import sys
 import os
-from pathlib import Path
+import shutil
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from functools import lru_cache
+import re
 
+import method_extractor
+from method_extractor import read_source
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # fall back to loading the whole report
+    ijson = None
+
+# Bugs whose file path contains "test" (any case) are skipped
+_TEST_PATH_RE = re.compile(r'test', re.IGNORECASE)
+
+# Errors raised for a malformed report.json by whichever parser reads it
+# (orjson's JSONDecodeError subclasses json.JSONDecodeError)
+_JSON_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
+
+# Written next to each project's output; records which report.json the output was converted from
+STAMP_FILE = ".report_stamp"
+
+def load_json(file_path):
+    """
+    Load a JSON file, using orjson when it is installed
+    """
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def iter_report_bugs(report_json):
+    """
+    Iterate over the bug entries of an Infer report
+    With ijson installed the report is stream-parsed, so only one bug is held in memory at a time
+    """
+    if ijson is not None:
+        # Read the report in 1 MiB chunks (ijson defaults to 64 KiB)
+        with open(report_json, 'rb') as f:
+            yield from ijson.items(f, 'item', buf_size=1 << 20)
+    else:
+        yield from load_json(report_json)
+
+def dump_json(data, file_path):
+    """
+    Write data as indented UTF-8 JSON, using orjson when it is installed
+    """
+    if orjson is not None:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        # Serialize and encode in memory first so the file gets a single binary write
+        data = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(file_path, 'wb') as f:
+            f.write(data)
+
+@lru_cache(maxsize=8192)
 def extract_method_name(procedure):
     """
     Extract method name from procedure string
@@ -14,10 +77,11 @@ def extract_method_name(procedure):
     """
     if not procedure:
         return ""
-    # Split by '(' and take the last part before that
-    method_part = procedure.split('(')[0]
-    # Split by '.' and take the last part
-    return method_part.split('.')[-1]
+    # Take the part before the first '('
+    method_part, _, _ = procedure.partition('(')
+    # Take the part after the last '.'
+    _, _, method_name = method_part.rpartition('.')
+    return method_name
 
 def get_bug_trace(bug):
     """
@@ -28,9 +92,6 @@ def get_bug_trace(bug):
         if not trace:
             return []
             
-        # 버그 트레이스의 모든 라인 번호를 수집
-        trace_lines = [entry.get('line_number', 0) for entry in trace]
-        
         return [{
             'line_number': entry.get('line_number', 0),
             'description': entry.get('description', '')
@@ -54,55 +115,110 @@ def get_buggy_lines(bug, method_start_line, method_end_line):
         return start_line, end_line
     return method_start_line, method_start_line  # Default to method start if no trace
 
-def get_method_code(file_path, method_name, bug_line):
+@lru_cache(maxsize=None)
+def method_declaration_pattern(method_name):
     """
-    Get the actual method code from the source file
+    Compile (once per method name) a regex matching the method name followed by '('
+    Word boundaries keep e.g. "get" from matching "target(" or "getName("
+    Only same-line whitespace may separate the name and '(', as the pattern is searched over the whole file
+    """
+    if not method_name:
+        return re.compile(r'\(')
+    return re.compile(rf'\b{re.escape(method_name)}[^\S\n]*\(')
+
+def find_method(text, line_starts, balances, method_name):
+    """
+    Find the method declaration and its body in the source
+    Returns (start_line, end_line, code) with 0-based line indices, or None if not found
     """
+    # Find method start by looking for method declaration: one regex search over the whole file,
+    # then the line index is the number of newlines before the match
+    match = method_declaration_pattern(method_name).search(text)
+    if match is None:
+        return None
+    start_line = text.count('\n', 0, match.start())
+        
+    # Count braces to find method end: the first line after the declaration where the file's running
+    # balance is back to its value before the declaration
+    base = balances[start_line - 1] if start_line else 0
     try:
-        if not os.path.exists(file_path):
-            return "File not found"
-            
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        # Find method start by looking for method declaration
-        start_line = -1
-        for i in range(len(lines)):
-            if method_name in lines[i] and '(' in lines[i]:
-                start_line = i
-                break
-                
-        if start_line == -1:
-            return "Method not found"
-            
-        # Extract method code
-        method_code = []
-        brace_count = 0
+        end_line = balances.index(base, start_line + 1)
+        code_end = end_line + 1
+    except ValueError:  # Braces never balance: take the rest of the file
         end_line = start_line
-        
-        for i in range(start_line, len(lines)):
-            line = lines[i]
-            method_code.append(line)
-            
-            # Count braces to find method end
-            brace_count += line.count('{') - line.count('}')
-            if brace_count == 0 and i > start_line:
-                end_line = i
-                break
-                
-        # Verify bug line is within method
-        if bug_line < start_line or bug_line > end_line:
-            return f"Bug line {bug_line} is outside method range ({start_line}-{end_line})"
+        code_end = len(balances)
             
-        return {
-            'code': ''.join(method_code),
-            'start_line': start_line + 1,  # Convert to 1-based index
-            'end_line': end_line + 1,      # Convert to 1-based index
-            'bug_line': bug_line
-        }
+    return start_line, end_line, text[line_starts[start_line]:line_starts[code_end]]
+
+@lru_cache(maxsize=4096)
+def extract_method(file_path, method_name):
+    """
+    Locate a method in a source file
+    Memoized on (file_path, method_name) so bugs in an already located method skip the read and scan
+    Returns (start_line, end_line, code) with 0-based line indices, or an error message string
+    """
+    try:
+        source = read_source(file_path)
+    except FileNotFoundError:  # Checked by opening rather than a separate os.path.exists stat
+        return "File not found"
+    except Exception as e:
+        return f"Error extracting code: {str(e)}"
         
+    try:
+        method = find_method(*source, method_name)
     except Exception as e:
         return f"Error extracting code: {str(e)}"
+        
+    if method is None:
+        return "Method not found"
+    return method
+
+def get_method_code(file_path, method_name, bug_line):
+    """
+    Get the actual method code from the source file
+    """
+    method = extract_method(file_path, method_name)
+    if isinstance(method, str):  # Error occurred
+        return method
+        
+    start_line, end_line, code = method
+            
+    # Verify bug line is within method
+    if bug_line < start_line or bug_line > end_line:
+        return f"Bug line {bug_line} is outside method range ({start_line}-{end_line})"
+        
+    return {
+        'code': code,
+        'start_line': start_line + 1,  # Convert to 1-based index
+        'end_line': end_line + 1,      # Convert to 1-based index
+        'bug_line': bug_line
+    }
+
+def report_stamp(report_json):
+    """
+    Identify a report.json by its mtime and size
+    The mtimes of this script and of method_extractor.py are included so changes to the conversion also invalidate old output
+    """
+    st = os.stat(report_json)
+    return (f"{st.st_mtime_ns}:{st.st_size}:{os.stat(__file__).st_mtime_ns}:"
+            f"{os.stat(method_extractor.__file__).st_mtime_ns}")
+
+def reuse_converted_project(project_name, project_path, old_output_dir, output_dir):
+    """
+    Move a project's output from the previous run into output_dir if its report.json is unchanged
+    Returns True if the old output was reused
+    """
+    old_project_dir = os.path.join(old_output_dir, project_name)
+    try:
+        with open(os.path.join(old_project_dir, STAMP_FILE), 'r', encoding='utf-8') as f:
+            stamp = f.read()
+        if stamp != report_stamp(os.path.join(project_path, "infer-out", "report.json")):
+            return False
+        os.rename(old_project_dir, os.path.join(output_dir, project_name))
+    except OSError:  # No stamp, no report.json or nothing to move
+        return False
+    print(f"Reusing unchanged output for {project_name}")
+    return True
 
 def convert_json_to_json(project_path, output_dir):
     """
@@ -111,9 +227,13 @@ def convert_json_to_json(project_path, output_dir):
     try:
         # Try to find report.json first
         report_json = os.path.join(project_path, "infer-out", "report.json")
+        stamp = None
         
         # If report.json doesn't exist, look for batch_summary_*.json in infer-results
-        if not os.path.exists(report_json):
+        if os.path.exists(report_json):
+            # Taken before reading, so a report rewritten mid-conversion is not stamped as converted
+            stamp = report_stamp(report_json)
+        else:
             infer_results_dir = os.path.join(os.path.dirname(project_path), "..", "infer-results")
             if os.path.exists(infer_results_dir):
                 batch_files = [f for f in os.listdir(infer_results_dir) if f.startswith("batch_summary_")]
@@ -127,9 +247,8 @@ def convert_json_to_json(project_path, output_dir):
                 print(f"Warning: No report.json found in {project_path}/infer-out")
                 return False
 
-        # Read JSON file
-        with open(report_json, 'r', encoding='utf-8') as f:
-            bug_reports = json.load(f)
+        # Read JSON file (bugs are streamed and consumed one at a time by the loop below)
+        bug_reports = iter_report_bugs(report_json)
 
         # If it's a batch summary file, extract the relevant project's bugs
         if "batch_summary" in report_json:
@@ -150,22 +269,20 @@ def convert_json_to_json(project_path, output_dir):
         output_file = os.path.join(project_dir, f"{project_name}_bugs.json")
 
         # Process each bug report
+        project_prefix = os.path.join(project_path, "")  # project_path with a trailing separator
         processed_bugs = []
         for bug in bug_reports:
             # Skip bugs in test files
             file_path = bug.get('file', '')
-            if 'test' in file_path.lower():
+            if _TEST_PATH_RE.search(file_path):
                 continue
                 
             method_name = extract_method_name(bug.get('procedure', ''))
             bug_line = bug.get('line', 0)
             
             # Get method code first to determine method bounds
-            method_info = get_method_code(
-                os.path.join(project_path, file_path),
-                method_name,
-                bug_line
-            )
+            source_path = file_path if os.path.isabs(file_path) else project_prefix + file_path
+            method_info = get_method_code(source_path, method_name, bug_line)
             
             if isinstance(method_info, str):  # Error occurred
                 print(f"Warning: {method_info} in {file_path}")
@@ -182,11 +299,8 @@ def convert_json_to_json(project_path, output_dir):
             bug_start = bug_line
             
             # bug_end_line은 method_end_line보다 작거나 같은 bug_trace 라인들 중 가장 큰 값
-            if bug_trace:
-                trace_lines = [entry['line_number'] for entry in bug_trace]
-                bug_end = max(line for line in trace_lines if line <= method_end)
-            else:
-                bug_end = bug_start
+            bug_end = max((entry['line_number'] for entry in bug_trace if entry['line_number'] <= method_end),
+                          default=bug_start)
                 
             processed_bug = {
                 'project': project_name,
@@ -207,8 +321,10 @@ def convert_json_to_json(project_path, output_dir):
             processed_bugs.append(processed_bug)
 
         # Write to JSON
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(processed_bugs, f, indent=2, ensure_ascii=False)
+        dump_json(processed_bugs, output_file)
+        if stamp is not None:
+            with open(os.path.join(project_dir, STAMP_FILE), 'w', encoding='utf-8') as f:
+                f.write(stamp)
 
         print(f"Successfully converted {report_json} to {output_file}")
         return True
@@ -216,7 +332,7 @@ def convert_json_to_json(project_path, output_dir):
     except FileNotFoundError:
         print(f"Error: Input file '{report_json}' not found")
         return False
-    except json.JSONDecodeError:
+    except _JSON_ERRORS:
         print(f"Error: Invalid JSON format in '{report_json}'")
         return False
     except Exception as e:
@@ -227,42 +343,59 @@ def process_all_projects(projects_dir, output_dir):
     """
     Process all projects in the given directory
     """
-    # Delete output directory if it exists
+    # Move an existing output directory aside; unchanged projects are taken back from it,
+    # and the rest is deleted by a pool worker while the projects convert
+    old_output_dir = None
     if os.path.exists(output_dir):
         print(f"Removing existing output directory: {output_dir}")
-        import shutil
-        shutil.rmtree(output_dir)
+        old_output_dir = os.path.normpath(output_dir) + ".old"
+        if os.path.exists(old_output_dir):  # Left over from an interrupted run
+            shutil.rmtree(old_output_dir)
+        os.rename(output_dir, old_output_dir)
 
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
 
-    # Get all subdirectories (projects)
-    projects = [d for d in os.listdir(projects_dir) 
-               if os.path.isdir(os.path.join(projects_dir, d))]
+    # Get all subdirectories (projects); DirEntry caches the file type, so no extra stat per entry
+    with os.scandir(projects_dir) as it:
+        projects = [(entry.name, entry.path) for entry in it if entry.is_dir()]
 
     if not projects:
+        if old_output_dir:
+            shutil.rmtree(old_output_dir, ignore_errors=True)
         print(f"No projects found in {projects_dir}")
         return False
 
+    # Skip projects whose report.json has not changed since the previous run
+    reused = set()
+    if old_output_dir:
+        reused = {project for project, project_path in projects
+                  if reuse_converted_project(project, project_path, old_output_dir, output_dir)}
+    pending = [project_path for project, project_path in projects if project not in reused]
+
+    # Convert projects in parallel; each project only writes into its own output directory
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        if old_output_dir:
+            executor.submit(shutil.rmtree, old_output_dir, ignore_errors=True)
+        converted = executor.map(convert_json_to_json, pending, repeat(output_dir))
+        results = [project in reused or next(converted) for project, _ in projects]
+
     success_count = 0
     all_bugs = []
     
-    for project in projects:
-        project_path = os.path.join(projects_dir, project)
-        if convert_json_to_json(project_path, output_dir):
+    for (project, project_path), converted in zip(projects, results):
+        if converted:
             success_count += 1
             
             # Read the project's bugs and add to all_bugs
             project_bugs_file = os.path.join(output_dir, project, f"{project}_bugs.json")
             if os.path.exists(project_bugs_file):
-                with open(project_bugs_file, 'r', encoding='utf-8') as f:
-                    all_bugs.extend(json.load(f))
+                all_bugs.extend(load_json(project_bugs_file))
 
     # Save all bugs to a single file
     if all_bugs:
         all_bugs_file = os.path.join(output_dir, "all_bugs.json")
-        with open(all_bugs_file, 'w', encoding='utf-8') as f:
-            json.dump(all_bugs, f, indent=2, ensure_ascii=False)
+        dump_json(all_bugs, all_bugs_file)
         print(f"\nSaved all {len(all_bugs)} bugs to {all_bugs_file}")
 
     print(f"\nProcessed {len(projects)} projects, {success_count} successful conversions")
@@ -4,7 +4,10 @@ import sys
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import random  # 파일 상단에 추가
@@ -22,6 +25,13 @@ class GitHubTrendCloner:
             "Accept": "application/vnd.github.v3+json"
         }
         
+        # API 요청은 세션 하나로 보내 TCP/TLS 연결을 재사용 (응답 gzip 압축은 requests가 기본으로 요청)
+        # 일시적인 서버 오류(502/503/504)는 간격을 늘려가며 최대 3번 재시도
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504])
+        self.session.mount("https://", HTTPAdapter(max_retries=retry))
+        
         # 저장소 저장 경로
         self.base_dir = Path("github-trends")
         self.java_dir = self.base_dir / "java"
@@ -33,6 +43,7 @@ class GitHubTrendCloner:
         self.max_repos = 10  # 최대 클론할 저장소 수
         self.min_stars = 1000  # 최소 별표 수
         self.max_stars = 100000  # 최대 별표 수
+        self.max_workers = 4  # 동시에 진행할 클론 수
 
 
     def print_warning(self):
@@ -52,10 +63,7 @@ class GitHubTrendCloner:
     def is_safe_repo(self, repo: dict) -> bool:
         """저장소가 안전한지 확인합니다."""
         # 최소/최대 별표 수 확인
-        if repo['stargazers_count'] < self.min_stars or repo['stargazers_count'] > self.max_stars:
-            return False
-            
-        return True
+        return self.min_stars <= repo['stargazers_count'] <= self.max_stars
 
     def get_trending_repos(self, days: int = 90) -> list:
         """GitHub Trending Java 저장소 목록을 가져옵니다."""
@@ -71,7 +79,7 @@ class GitHubTrendCloner:
             print(f"{self.GREEN}GitHub Trending Java 저장소를 가져오는 중...{self.NC}")
             print(f"스타 수 범위: {self.min_stars:,} ~ {self.max_stars:,}개")
             
-            response = requests.get(self.api_url, headers=self.headers, params=query)
+            response = self.session.get(self.api_url, params=query)
             response.raise_for_status()
             
             repos = response.json()["items"]
@@ -81,20 +89,18 @@ class GitHubTrendCloner:
                 print(f"{self.YELLOW}저장소를 찾지 못했습니다. 검색 조건을 완화해보겠습니다...{self.NC}")
                 # 검색 조건 완화
                 query["q"] = f"language:java stars:>={self.min_stars}"  # 생성일 제한 제거
-                response = requests.get(self.api_url, headers=self.headers, params=query)
+                time.sleep(self.delay)  # API 요청 제한 방지
+                response = self.session.get(self.api_url, params=query)
                 response.raise_for_status()
                 repos = response.json()["items"]
                 print(f"{self.GREEN}조건 완화 후 {len(repos)}개의 저장소를 찾았습니다.{self.NC}")
             
             # 안전한 저장소만 필터링
-            safe_repos = [repo for repo in repos if self.is_safe_repo(repo)]
+            safe_repos = list(filter(self.is_safe_repo, repos))
             print(f"안전 기준을 통과한 저장소: {len(safe_repos)}개")
             
-            # 결과를 랜덤하게 섞기
-            random.shuffle(safe_repos)
-            
-            # 최대 개수 제한
-            return safe_repos[:self.max_repos]
+            # 최대 개수만큼 랜덤하게 고르기 (전체를 섞은 뒤 자르는 것과 같은 결과를 필요한 개수만 뽑아서 얻음)
+            return random.sample(safe_repos, min(self.max_repos, len(safe_repos)))
             
         except requests.exceptions.RequestException as e:
             print(f"{self.RED}GitHub API 요청 중 오류 발생: {e}{self.NC}")
@@ -111,14 +117,17 @@ class GitHubTrendCloner:
                 print(f"{self.YELLOW}이미 존재하는 저장소: {repo_name}{self.NC}")
                 return True
             
-            print(f"\n{self.GREEN}클론 중: {repo_name}{self.NC}")
-            print(f"설명: {repo.get('description', '설명 없음')}")
-            print(f"별표: {repo['stargazers_count']:,}개")
-            print(f"포크: {repo['forks_count']:,}개")
-            print(f"크기: {repo['size'] / 1024:.1f} MB")
-            print(f"생성일: {repo['created_at']}")
-            print(f"최근 업데이트: {repo['updated_at']}")
-            print(f"URL: {repo['html_url']}")
+            # 여러 스레드가 동시에 클론하므로 저장소 정보는 print 한 번으로 출력해 줄이 섞이지 않게 함
+            print("\n".join([
+                f"\n{self.GREEN}클론 중: {repo_name}{self.NC}",
+                f"설명: {repo.get('description', '설명 없음')}",
+                f"별표: {repo['stargazers_count']:,}개",
+                f"포크: {repo['forks_count']:,}개",
+                f"크기: {repo['size'] / 1024:.1f} MB",
+                f"생성일: {repo['created_at']}",
+                f"최근 업데이트: {repo['updated_at']}",
+                f"URL: {repo['html_url']}",
+            ]))
             
             # 얕은 클론 (최신 커밋만)
             subprocess.run(
@@ -169,12 +178,9 @@ class GitHubTrendCloner:
         if not repos:
             return
         
-        # 각 저장소 클론
-        success_count = 0
-        for repo in repos:
-            if self.clone_repository(repo):
-                success_count += 1
-            time.sleep(self.delay)  # API 요청 제한 방지
+        # 각 저장소 클론 (git clone은 API 요청 제한과 무관하므로 딜레이 없이 여러 개를 동시에 진행)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            success_count = sum(executor.map(self.clone_repository, repos))
         
         # 결과 출력
         print(f"\n{self.GREEN}클론 완료!{self.NC}")
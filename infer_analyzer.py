@@ -4,15 +4,92 @@ import os
 import sys
 import json
 import subprocess
+import shutil
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+from collections import defaultdict
+from functools import lru_cache
+from bisect import bisect_right
+import re
 import time
 
+from method_extractor import read_source
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 모듈 사용
+    orjson = None
+
+def _detect_wsl() -> bool:
+    """WSL 환경인지 /proc/version으로 확인합니다."""
+    try:
+        with open('/proc/version', 'rb') as f:
+            return b'microsoft' in f.read().lower()
+    except OSError:
+        return False
+
+# WSL 여부는 실행 중에 바뀌지 않으므로 모듈을 불러올 때 한 번만 확인
+IS_WSL = _detect_wsl()
+
+# mvn -v 출력의 버전 줄 ("Apache Maven 3.9.5 (...)")
+_MAVEN_VERSION_RE = re.compile(r'Apache Maven (\d+(?:\.\d+)*)')
+
+# mvn -v 결과 캐시 파일 (첫 줄: mvn 실행 파일 경로와 수정 시각, 둘째 줄: 버전)
+MAVEN_VERSION_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "auto_infer", "mvn_version")
+
+def _maven_version() -> Optional[str]:
+    """
+    설치된 Maven 버전을 반환합니다. mvn이 없거나 실행에 실패하면 None을 반환합니다.
+    mvn -v는 JVM을 새로 띄워 느리므로, mvn 실행 파일의 실제 경로와 수정 시각이 같으면 디스크에 캐시된 결과를 씁니다.
+    """
+    mvn = shutil.which("mvn")
+    if mvn is None:
+        return None
+    mvn = os.path.realpath(mvn)
+    key = f"{mvn}:{os.stat(mvn).st_mtime_ns}"
+    
+    try:
+        with open(MAVEN_VERSION_CACHE, "r", encoding="utf-8") as f:
+            cached_key, _, cached_version = f.read().partition("\n")
+        if cached_key == key and cached_version:
+            return cached_version
+    except OSError:
+        pass
+        
+    result = subprocess.run([mvn, "-v"], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    match = _MAVEN_VERSION_RE.search(result.stdout)
+    if match is None:
+        raise ValueError(f"mvn -v 출력에서 버전을 찾을 수 없습니다: {result.stdout.strip()}")
+    version = match.group(1)
+    
+    try:
+        os.makedirs(os.path.dirname(MAVEN_VERSION_CACHE), exist_ok=True)
+        with open(MAVEN_VERSION_CACHE, "w", encoding="utf-8") as f:
+            f.write(f"{key}\n{version}")
+    except OSError:
+        pass  # 캐시를 못 써도 다음 실행에서 다시 확인하면 됨
+    return version
+
+# 메서드 선언 줄로 볼 키워드
+_DECLARATION_RE = re.compile(r'public|private|protected|static')
+
+@lru_cache(maxsize=256)
+def _declaration_lines(file_path: str) -> List[int]:
+    """선언 키워드가 들어 있는 줄 번호(0-based)를 오름차순으로 반환합니다. 파일마다 한 번만 계산합니다."""
+    text, line_starts, _ = read_source(file_path)
+    return sorted({bisect_right(line_starts, match.start()) - 1 for match in _DECLARATION_RE.finditer(text)})
+
 class InferAnalyzer:
+    # 빌드 실패 시 화면에 보여줄 빌드 로그 끝부분 크기
+    LOG_TAIL_SIZE = 8192
+
     def __init__(self, project_path: str):
         # WSL 환경 확인
-        self.is_wsl = os.path.exists('/proc/version') and 'microsoft' in open('/proc/version').read().lower()
+        self.is_wsl = IS_WSL
         
         # WSL 환경에서 경로 변환
         if self.is_wsl:
@@ -25,9 +102,10 @@ class InferAnalyzer:
         else:
             self.project_path = project_path
             
-        self.report_dir = "infer-reports"
+        self.report_dir = os.path.join(self.project_path, "infer-reports")
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.report_file = f"{self.report_dir}/report_{self.timestamp}.txt"
+        self.build_log_file = f"{self.report_dir}/build_{self.timestamp}.log"
         
         # 색상 코드
         self.RED = '\033[0;31m'
@@ -39,8 +117,9 @@ class InferAnalyzer:
         """실행 권한을 확인합니다."""
         try:
             # gradlew 파일의 실행 권한 확인 및 설정
-            if os.path.exists("./gradlew"):
-                os.chmod("./gradlew", 0o755)
+            gradlew = os.path.join(self.project_path, "gradlew")
+            if os.path.exists(gradlew):
+                os.chmod(gradlew, 0o755)
             return True
         except Exception as e:
             print(f"{self.RED}권한 설정 중 오류 발생: {e}{self.NC}")
@@ -107,20 +186,15 @@ export PATH=$M2_HOME/bin:$PATH
         """환경 설정을 확인합니다."""
         try:
             # Maven 버전 확인
-            mvn_version_cmd = ["mvn", "-v"]
-            result = subprocess.run(mvn_version_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
+            version = _maven_version()
+            if version is None:
                 print(f"{self.RED}Maven이 설치되어 있지 않습니다.{self.NC}")
                 print(f"{self.YELLOW}Maven을 설치하려면 다음 명령어를 실행하세요:{self.NC}")
                 print("python upgrade_maven.py")
                 return False
                 
-            # Maven 버전 파싱
-            version_line = [line for line in result.stdout.split('\n') if 'Apache Maven' in line][0]
-            version = version_line.split()[2]  # "Apache Maven 3.x.x" 형식에서 버전 추출
-            major_version = int(version.split('.')[1])  # 3.x.x에서 x 추출
-            
-            if major_version < 8:
+            # (major, minor)로 비교해야 4.x도 3.8 이상으로 판단됨
+            if tuple(int(part) for part in version.split('.')[:2]) < (3, 8):
                 print(f"{self.RED}Maven 버전이 너무 낮습니다. 3.8 이상이 필요합니다. (현재: {version}){self.NC}")
                 print(f"{self.YELLOW}Maven을 업그레이드하려면 다음 명령어를 실행하세요:{self.NC}")
                 print("python upgrade_maven.py")
@@ -146,51 +220,40 @@ export PATH=$M2_HOME/bin:$PATH
             print(f"{self.GREEN}Infer 분석을 시작합니다...{self.NC}")
             print(f"프로젝트 경로: {self.project_path}")
 
-            # 프로젝트 디렉토리로 이동
+            # 프로젝트 디렉토리 확인 (작업 디렉토리는 변경하지 않고 cwd로 전달)
             if not os.path.exists(self.project_path):
                 print(f"{self.RED}Error: 프로젝트 경로가 존재하지 않습니다: {self.project_path}{self.NC}")
                 return False
-                
-            os.chdir(self.project_path)
             
             # 권한 확인
             if not self.check_permissions():
                 return False
 
-            # infer-out 디렉토리 정리 (최대 3번 시도)
-            infer_out = Path("infer-out")
-            for attempt in range(3):
-                if infer_out.exists():
-                    try:
-                        import shutil
-                        # 강제로 디렉토리 삭제
+            # infer-out 디렉토리 정리: infer-out.old로 이름만 바꾸고 실제 삭제는 백그라운드 스레드에서 진행
+            # (이름 변경은 즉시 끝나므로 Infer는 기다리지 않고 새 infer-out으로 바로 시작)
+            infer_out = Path(self.project_path) / "infer-out"
+            if infer_out.exists():
+                old_infer_out = infer_out.with_name("infer-out.old")
+                shutil.rmtree(old_infer_out, ignore_errors=True)  # 이전 실행이 중간에 끊겨 남은 경우
+                try:
+                    os.rename(infer_out, old_infer_out)
+                    threading.Thread(target=shutil.rmtree, args=(old_infer_out,), kwargs={"ignore_errors": True}).start()
+                except OSError:
+                    # 이름을 바꿀 수 없으면(파일이 잠긴 경우 등) 그 자리에서 삭제 (최대 3번 시도)
+                    for attempt in range(3):
                         shutil.rmtree(infer_out, ignore_errors=True)
-                        # 디렉토리가 완전히 삭제될 때까지 대기
-                        time.sleep(2)
-                        
-                        # 디렉토리가 실제로 삭제되었는지 확인
                         if not infer_out.exists():
                             break
-                        else:
-                            print(f"{self.YELLOW}경고: infer-out 디렉토리 삭제 재시도 중... (시도 {attempt + 1}/3){self.NC}")
-                            # 추가 정리 시도
-                            try:
-                                for item in infer_out.glob("*"):
-                                    if item.is_file():
-                                        item.unlink()
-                                    elif item.is_dir():
-                                        shutil.rmtree(item, ignore_errors=True)
-                            except Exception as e:
-                                print(f"{self.YELLOW}경고: 추가 정리 중 오류 발생: {e}{self.NC}")
-                    except Exception as e:
-                        print(f"{self.YELLOW}경고: infer-out 디렉토리 정리 중 오류 발생: {e}{self.NC}")
                         if attempt == 2:  # 마지막 시도였다면
                             print(f"{self.RED}Error: infer-out 디렉토리를 정리할 수 없습니다.{self.NC}")
                             return False
-                        time.sleep(1)  # 다음 시도 전 대기
+                        print(f"{self.YELLOW}경고: infer-out 디렉토리 삭제 재시도 중... (시도 {attempt + 1}/3){self.NC}")
+                        # 파일 잠금이 늦게 풀리는 WSL/Windows에서만 잠깐 기다렸다가 재시도
+                        if IS_WSL or sys.platform == "win32":
+                            time.sleep(0.2)
 
             # .global.tenv 파일 정리
-            tenv_file = Path(".global.tenv")
+            tenv_file = Path(self.project_path) / ".global.tenv"
             if tenv_file.exists():
                 try:
                     tenv_file.unlink()
@@ -199,11 +262,11 @@ export PATH=$M2_HOME/bin:$PATH
                     # 계속 진행
 
             # 빌드 시스템 감지 및 적절한 명령어 선택
-            if os.path.exists("pom.xml"):
+            if os.path.exists(os.path.join(self.project_path, "pom.xml")):
                 # Maven 프로젝트의 경우
                 print("1단계: Maven 컴파일 및 Infer 캡처...")
                 cmd = ["infer", "run", "--keep-going", "--", "mvn", "clean", "compile", "-DskipTests"]
-            elif os.path.exists("build.gradle"):
+            elif os.path.exists(os.path.join(self.project_path, "build.gradle")):
                 # Gradle 프로젝트의 경우
                 print("1단계: Gradle 컴파일 및 Infer 캡처...")
                 cmd = ["infer", "run", "--keep-going", "--", "./gradlew", "clean", "compileJava"]
@@ -215,13 +278,20 @@ export PATH=$M2_HOME/bin:$PATH
             env = os.environ.copy()
             env["MAVEN_OPTS"] = "-Xmx4g"  # Maven에 더 많은 메모리 할당
             
-            # 명령어 실행
+            # 명령어 실행 (빌드 출력은 메모리에 모으지 않고 로그 파일로 바로 기록)
             print(f"실행 명령어: {' '.join(cmd)}")
-            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            print(f"빌드 로그: {self.build_log_file}")
+            os.makedirs(self.report_dir, exist_ok=True)
+            with open(self.build_log_file, 'wb', buffering=1 << 20) as log:
+                result = subprocess.run(cmd, cwd=self.project_path, env=env, stdout=log, stderr=subprocess.STDOUT)
             
             if result.returncode != 0:
                 print(f"{self.YELLOW}컴파일 중 경고가 발생했습니다.{self.NC}")
-                print(result.stderr)
+                # 로그 끝부분만 읽어서 출력
+                with open(self.build_log_file, 'rb') as f:
+                    f.seek(0, os.SEEK_END)
+                    f.seek(max(0, f.tell() - self.LOG_TAIL_SIZE))
+                    print(f.read().decode('utf-8', 'replace'))
                 # 계속 진행
             
             # Infer 분석 결과 확인
@@ -245,7 +315,7 @@ export PATH=$M2_HOME/bin:$PATH
                 if not (infer_out / "report.json").exists():
                     print("Infer 보고서 생성 중...")
                     try:
-                        subprocess.run(["infer", "report"], check=True)
+                        subprocess.run(["infer", "report"], cwd=self.project_path, check=True)
                         if (infer_out / "report.json").exists():
                             break
                     except subprocess.CalledProcessError as e:
@@ -270,13 +340,18 @@ export PATH=$M2_HOME/bin:$PATH
     def analyze_results(self) -> list:
         """Infer 분석 결과를 분석합니다."""
         try:
-            report_file = Path("infer-out/report.json")
+            report_file = Path(self.project_path) / "infer-out" / "report.json"
             if not report_file.exists():
                 print(f"{self.YELLOW}경고: 분석 결과 파일을 찾을 수 없습니다: {report_file}{self.NC}")
                 return []
             
-            with open(report_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            # orjson이 설치되어 있으면 바이트 그대로 넘겨 더 빠르게 파싱
+            if orjson is not None:
+                with open(report_file, "rb") as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(report_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             
             if not isinstance(data, list):
                 print(f"{self.YELLOW}경고: 예상치 못한 결과 형식입니다.{self.NC}")
@@ -294,12 +369,14 @@ export PATH=$M2_HOME/bin:$PATH
     def get_method_code(self, file_path: str, method_name: str, line_number: int) -> str:
         """메서드의 실제 코드를 추출합니다."""
         try:
-            if not os.path.exists(file_path):
+            # 파일 존재 여부는 따로 stat 하지 않고 캐시된 읽기의 FileNotFoundError로 판단
+            # (소스 캐시는 generate_bug_report와 같은 method_extractor.read_source를 사용)
+            try:
+                text, line_starts, balances = read_source(file_path)
+                declarations = _declaration_lines(file_path)
+            except FileNotFoundError:
                 return "파일을 찾을 수 없습니다."
                 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
             # 메서드 시그니처 파싱
             method_parts = method_name.split('.')
             class_name = method_parts[-2] if len(method_parts) > 1 else ""
@@ -307,62 +384,74 @@ export PATH=$M2_HOME/bin:$PATH
             
             # 메서드 시작과 끝을 찾기 위한 변수
             start_line = max(0, line_number - 1)  # 0-based index
-            end_line = min(len(lines), line_number + 50)  # 최대 50줄까지
-            method_code = []
-            brace_count = 0
+            end_line = min(len(balances), line_number + 50)  # 최대 50줄까지
             found_method = False
             
             # 메서드 시작 부분 찾기
-            for i in range(start_line, -1, -1):
-                line = lines[i]
+            # 선언 키워드가 있는 줄 목록을 bisect로 버그 라인까지 자른 뒤, 가까운 줄부터 파일 처음까지 거슬러 올라가며 확인
+            for i in reversed(declarations[:bisect_right(declarations, start_line)]):
+                line = text[line_starts[i]:line_starts[i + 1]]
                 # 메서드 시그니처와 클래스 이름을 모두 확인
                 if method_sig in line and (not class_name or class_name in line):
-                    # 메서드 선언 라인인지 확인 (public, private, protected 등으로 시작)
-                    if any(access in line for access in ['public', 'private', 'protected', 'static']):
-                        start_line = i
-                        found_method = True
-                        break
+                    start_line = i
+                    found_method = True
+                    break
                     
             if not found_method:
                 return "메서드를 찾을 수 없습니다."
                 
-            # 메서드 코드 추출
-            for i in range(start_line, end_line):
-                line = lines[i]
-                method_code.append(line)
-                
-                # 중괄호 카운트로 메서드 범위 파악
-                brace_count += line.count('{') - line.count('}')
-                if brace_count == 0 and i > start_line:
-                    break
+            # 메서드 코드 추출 (중괄호 누적 합이 선언 직전 값으로 돌아오는 줄까지를 메서드 범위로 봄)
+            base = balances[start_line - 1] if start_line else 0
+            try:
+                method_end = balances.index(base, start_line + 1, end_line) + 1
+            except ValueError:  # 범위 안에서 닫히지 않으면 범위 끝까지
+                method_end = end_line
                     
-            return ''.join(method_code)
+            return text[line_starts[start_line]:line_starts[method_end]]
             
         except Exception as e:
             return f"코드 추출 중 오류 발생: {str(e)}"
 
     def generate_report(self, issues: List[Dict]) -> str:
         """분석 결과를 보고서 형식으로 생성합니다."""
+        return "".join(self.iter_report(issues))
+
+    def iter_report(self, issues: List[Dict]) -> Iterator[str]:
+        """보고서를 이슈 하나씩 문자열 조각으로 만듭니다. 조각을 이어 붙이면 generate_report의 결과가 됩니다."""
         if not issues:
-            return "발견된 문제가 없습니다."
-            
-        report = []
-        for issue in issues:
-            report.append(f"\n문제 유형: {issue['bug_type']}")
-            report.append(f"파일: {issue['file']}")
-            report.append(f"라인: {issue['line']}")
-            report.append(f"메서드: {issue['procedure']}")
-            report.append(f"설명: {issue['description']}")
-            
-            # 메서드 코드 추출
-            method_code = self.get_method_code(issue['file'], issue['procedure'], issue['line'])
-            report.append("\n관련 코드:")
-            report.append("```java")
-            report.append(method_code)
-            report.append("```")
-            report.append("-" * 80)
-            
-        return "\n".join(report)
+            yield "발견된 문제가 없습니다."
+            return
+            
+        # 파일별로 이슈를 묶어 파일마다 한 번만 읽고, 같은 (메서드, 라인) 이슈는 코드를 한 번만 추출
+        issues_by_file = defaultdict(list)
+        for index, issue in enumerate(issues):
+            issues_by_file[issue['file']].append(index)
+            
+        method_codes = [None] * len(issues)
+        for file, indices in issues_by_file.items():
+            file_path = os.path.join(self.project_path, file)
+            extracted = {}
+            for index in sorted(indices, key=lambda i: issues[i]['line']):
+                key = (issues[index]['procedure'], issues[index]['line'])
+                if key not in extracted:
+                    extracted[key] = self.get_method_code(file_path, *key)
+                method_codes[index] = extracted[key]
+            
+        separator = ""
+        for issue, method_code in zip(issues, method_codes):
+            yield separator + "\n".join([
+                f"\n문제 유형: {issue['bug_type']}",
+                f"파일: {issue['file']}",
+                f"라인: {issue['line']}",
+                f"메서드: {issue['procedure']}",
+                f"설명: {issue['description']}",
+                "\n관련 코드:",
+                "```java",
+                method_code,
+                "```",
+                "-" * 80,
+            ])
+            separator = "\n"  # 이슈 사이 줄바꿈
 
     def print_summary(self, issues: List[Dict]) -> None:
         """분석 결과 요약을 출력합니다."""
@@ -383,12 +472,11 @@ export PATH=$M2_HOME/bin:$PATH
         """Infer 분석을 실행합니다."""
         if self.run_infer():
             issues = self.analyze_results()
-            report = self.generate_report(issues)
             
-            # 보고서 파일로 저장
+            # 보고서 파일로 저장 (전체 문자열을 메모리에 만들지 않고 이슈 단위로 바로 기록)
             Path(self.report_dir).mkdir(exist_ok=True)
-            with open(self.report_file, 'w', encoding='utf-8') as f:
-                f.write(report)
+            with open(self.report_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.writelines(self.iter_report(issues))
             
             self.print_summary(issues)
             return True
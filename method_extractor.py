@@ -0,0 +1,27 @@
+"""
+Source file reading shared by generate_bug_report.py and infer_analyzer.py
+Both locate methods in the same Java files, so they share one cache of parsed sources
+"""
+
+from itertools import accumulate
+from functools import lru_cache
+
+@lru_cache(maxsize=256)
+def read_source(file_path):
+    """
+    Read a source file as (text, line_starts, balances)
+    line_starts[i] is the offset of line i in text; a final entry marks the end of the last line
+    balances[i] is the running '{' minus '}' count up to and including line i
+    Only the text is kept, not a str per line; method code is sliced straight out of it
+    Memoized so a file holding many bugs is read and counted only once
+    Raises OSError or UnicodeDecodeError if the file cannot be read
+    """
+    # 64 KiB buffer: most source files are read in a single read call
+    with open(file_path, 'r', encoding='utf-8', buffering=1 << 16) as f:
+        text = f.read()
+    lines = text.split('\n')
+    if not lines[-1]:  # Text ends with a newline (or is empty): no line after it
+        lines.pop()
+    line_starts = list(accumulate((len(line) + 1 for line in lines), initial=0))
+    balances = list(accumulate(line.count('{') - line.count('}') for line in lines))
+    return text, line_starts, balances
@@ -3,92 +3,226 @@ import os
 import subprocess
 import sys
 import shutil
+import hashlib
+import re
+import tarfile
+import urllib.request
+
+# 내려받은 Maven 배포 파일을 버전별로 보관하는 캐시 디렉토리
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "auto_infer")
+
+# ~/.bashrc에 Maven 환경 변수 블록을 이미 넣었는지 확인하는 표시
+BASHRC_MARKER = "# auto_infer:maven"
+
+# mvn -v 출력의 "Apache Maven 3.x.x" 줄에서 버전을 뽑는 정규식
+_MVN_VER_RE = re.compile(r"Apache Maven (\S+)")
+
+# 업그레이드가 필요 없는 최소 Maven 버전 (major, minor)
+MIN_MAVEN_VERSION = (3, 8)
+_VERSION_PREFIX_RE = re.compile(r"(\d+)\.(\d+)")
+
+# 출력 색상 (터미널이 아닌 곳으로 출력을 돌리면 색상 코드를 넣지 않음)
+if sys.stdout.isatty():
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    NC = '\033[0m'  # No Color
+else:
+    GREEN = RED = YELLOW = NC = ''
 
 class MavenUpgrader:
     def __init__(self):
-        self.GREEN = '\033[92m'
-        self.RED = '\033[91m'
-        self.YELLOW = '\033[93m'
-        self.NC = '\033[0m'  # No Color
+        self._current_version = None  # check_current_version 결과 (mvn -v는 JVM을 띄우므로 한 번만 실행)
 
     def check_current_version(self):
         """현재 Maven 버전을 확인합니다."""
+        if self._current_version:
+            return self._current_version
+        # PATH에 mvn이 없으면 프로세스를 띄우지 않고 바로 반환
+        mvn_path = shutil.which("mvn")
+        if not mvn_path:
+            print(f"{RED}Maven이 설치되어 있지 않습니다.{NC}")
+            return None
         try:
-            result = subprocess.run(["mvn", "-v"], capture_output=True, text=True)
+            result = subprocess.run([mvn_path, "-v"], capture_output=True, text=True)
             if result.returncode != 0:
-                print(f"{self.RED}Maven이 설치되어 있지 않습니다.{self.NC}")
+                print(f"{RED}Maven이 설치되어 있지 않습니다.{NC}")
                 return None
             
-            # 버전 정보 파싱
-            version_line = [line for line in result.stdout.split('\n') if 'Apache Maven' in line][0]
-            version = version_line.split()[2]  # "Apache Maven 3.x.x" 형식에서 버전 추출
+            # 버전 정보 파싱 (첫 번째 "Apache Maven 3.x.x" 줄에서 버전 추출)
+            m = _MVN_VER_RE.search(result.stdout)
+            if not m:
+                print(f"{RED}Maven 버전 확인 중 오류 발생: 버전 정보를 찾을 수 없습니다.{NC}")
+                return None
+            version = m.group(1)
+            self._current_version = version
             return version
         except Exception as e:
-            print(f"{self.RED}Maven 버전 확인 중 오류 발생: {e}{self.NC}")
+            print(f"{RED}Maven 버전 확인 중 오류 발생: {e}{NC}")
             return None
 
-    def install_maven(self, version="3.9.5"):
-        """Maven을 지정된 버전으로 설치합니다."""
+    def download(self, url, path, sha512=None):
+        """
+        url을 path로 내려받습니다. 임시 파일에 받은 뒤 이름을 바꾸므로 중간에 끊겨도 path에는 완전한 파일만 남습니다.
+        sha512를 주면 받은 파일의 해시와 비교해서 다르면 ValueError를 냅니다.
+        aria2c가 설치되어 있으면 연결 여러 개로 나눠 받고, 없으면 urllib으로 받으면서 해시를 함께 계산합니다.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        if shutil.which("aria2c"):
+            subprocess.run(["aria2c", "-x", "8", "-s", "8", "--quiet", "--allow-overwrite=true",
+                            "-d", os.path.dirname(tmp_path), "-o", os.path.basename(tmp_path), url], check=True)
+            actual_sha512 = self.file_sha512(tmp_path)
+        else:
+            digest = hashlib.sha512()
+            with urllib.request.urlopen(url) as response, open(tmp_path, "wb") as f:
+                while chunk := response.read(1024 * 1024):
+                    digest.update(chunk)
+                    f.write(chunk)
+            actual_sha512 = digest.hexdigest()
+        if sha512 is not None and actual_sha512 != sha512:
+            os.remove(tmp_path)
+            raise ValueError(f"SHA-512 체크섬이 일치하지 않습니다: {url}")
+        os.replace(tmp_path, path)
+
+    def fetch_sha512(self, url):
+        """url과 함께 배포되는 .sha512 파일에서 체크섬을 가져옵니다."""
+        with urllib.request.urlopen(f"{url}.sha512") as response:
+            return response.read().decode().split()[0].lower()
+
+    def file_sha512(self, path):
+        """파일의 SHA-512 체크섬을 계산합니다."""
+        digest = hashlib.sha512()
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def install_tree(self, maven_tar, version, maven_dir):
+        """
+        Maven 압축 파일을 임시 디렉토리를 거치지 않고 maven_dir에 바로 풀고, 옆의 maven 링크가 maven_dir을 가리키게 합니다.
+        /opt 아래에 쓰므로 root 권한이 필요합니다. root가 아니면 install_maven이 sudo로 이 메서드만 따로 실행합니다.
+        """
+        # 압축 파일 안의 apache-maven-{version}/ 접두사를 떼고 maven_dir 바로 아래에 풂
+        prefix = f"apache-maven-{version}/"
+        
+        def members(tar):
+            for member in tar:
+                if member.name.startswith(prefix):
+                    member.name = member.name[len(prefix):]
+                    if member.islnk() and member.linkname.startswith(prefix):
+                        member.linkname = member.linkname[len(prefix):]
+                    yield member
+        
+        os.makedirs(maven_dir, exist_ok=True)
+        # 256 KiB씩 읽고, 파일을 풀 때는 2 MiB 단위로 복사 (tarfile 기본값은 각각 10 KiB, 16 KiB)
+        with tarfile.open(maven_tar, mode="r|gz", bufsize=256 * 1024, copybufsize=2 * 1024 * 1024) as tar:
+            # 경로 조작 등 위험한 항목을 막는 필터 (지원하는 파이썬 버전에서만 적용됨)
+            tar.extraction_filter = getattr(tarfile, "data_filter", None)
+            tar.extractall(maven_dir, members=members(tar))
+        
+        # 새 링크를 옆에 만든 뒤 rename으로 교체하므로 maven 링크가 없는 순간이 생기지 않음
+        link = os.path.join(os.path.dirname(maven_dir), "maven")
+        link_tmp = f"{link}.tmp"
+        if os.path.lexists(link_tmp):
+            os.unlink(link_tmp)
+        os.symlink(maven_dir, link_tmp)
+        os.replace(link_tmp, link)
+
+    def install_maven(self, version="3.9.5", deep_verify=False):
+        """
+        Maven을 지정된 버전으로 설치합니다.
+        설치 확인은 mvn 실행 파일만 검사하고, deep_verify=True일 때만 mvn -v를 실제로 실행합니다.
+        """
         try:
-            print(f"{self.GREEN}Maven {version} 설치를 시작합니다...{self.NC}")
+            print(f"{GREEN}Maven {version} 설치를 시작합니다...{NC}")
             
-            # 임시 디렉토리 생성
-            temp_dir = "/tmp/maven_install"
-            os.makedirs(temp_dir, exist_ok=True)
+            maven_dir = f"/opt/maven-{version}"
+            is_root = os.geteuid() == 0
             
-            # Maven 다운로드
+            # Maven 다운로드 (같은 버전을 이미 받아 둔 적이 있으면 캐시된 파일 사용)
+            # 받을 때 공식 .sha512 체크섬을 확인하고 캐시에 함께 저장해 두었다가, 캐시를 쓸 때 다시 확인
             maven_url = f"https://archive.apache.org/dist/maven/maven-3/{version}/binaries/apache-maven-{version}-bin.tar.gz"
-            maven_tar = f"{temp_dir}/maven.tar.gz"
+            maven_tar = os.path.join(CACHE_DIR, f"apache-maven-{version}-bin.tar.gz")
+            maven_sha512 = f"{maven_tar}.sha512"
             
-            print(f"Maven {version} 다운로드 중...")
-            subprocess.run(["wget", "-O", maven_tar, maven_url], check=True)
+            cached = False
+            if os.path.exists(maven_tar) and os.path.exists(maven_sha512):
+                with open(maven_sha512, "r") as f:
+                    cached = self.file_sha512(maven_tar) == f.read().strip()
+                if cached:
+                    print(f"캐시된 Maven {version} 파일을 사용합니다: {maven_tar}")
+                else:
+                    print(f"{YELLOW}캐시된 Maven 파일의 체크섬이 맞지 않아 다시 다운로드합니다.{NC}")
             
-            print("Maven 압축 해제 중...")
-            subprocess.run(["tar", "xzf", maven_tar, "-C", temp_dir], check=True)
+            if not cached:
+                expected_sha512 = self.fetch_sha512(maven_url)
+                # 저장해 둔 체크섬이 없어도 받아 둔 파일이 공식 체크섬과 같으면 다시 받지 않음 (예: 이전 실행이 체크섬 저장 전에 끊긴 경우)
+                if os.path.exists(maven_tar) and self.file_sha512(maven_tar) == expected_sha512:
+                    print(f"캐시된 Maven {version} 파일이 공식 체크섬과 일치하여 그대로 사용합니다: {maven_tar}")
+                else:
+                    print(f"Maven {version} 다운로드 중...")
+                    self.download(maven_url, maven_tar, expected_sha512)
+                with open(maven_sha512, "w") as f:
+                    f.write(expected_sha512)
             
-            # 기존 Maven 디렉토리 정리
-            maven_dir = f"/opt/maven-{version}"
+            # 기존 Maven 디렉토리 정리 (다운로드나 체크섬 확인이 실패하면 기존 설치를 그대로 두도록 새 파일을 확인한 뒤에 지움)
             if os.path.exists(maven_dir):
                 print(f"기존 Maven 디렉토리 제거 중: {maven_dir}")
-                subprocess.run(["sudo", "rm", "-rf", maven_dir], check=True)
+                if is_root:
+                    shutil.rmtree(maven_dir)
+                else:
+                    subprocess.run(["sudo", "rm", "-rf", maven_dir], check=True)
             
-            # Maven 설치
+            # Maven 설치 및 심볼릭 링크 생성 (tar 프로세스나 임시 디렉토리 없이 maven_dir에 바로 풂)
             print(f"Maven을 {maven_dir}에 설치 중...")
-            subprocess.run(["sudo", "mv", f"{temp_dir}/apache-maven-{version}", maven_dir], check=True)
-            
-            # 심볼릭 링크 생성
-            subprocess.run(["sudo", "ln", "-sf", maven_dir, "/opt/maven"], check=True)
+            if is_root:
+                self.install_tree(maven_tar, version, maven_dir)
+            else:
+                # root가 아니면 install_tree만 sudo로 실행 (sudo 한 번으로 압축 해제와 링크 교체를 함께 처리)
+                script = ("import sys; sys.path.insert(0, sys.argv[1]); "
+                          "from upgrade_maven import MavenUpgrader; MavenUpgrader().install_tree(*sys.argv[2:])")
+                subprocess.run(["sudo", sys.executable, "-c", script,
+                                os.path.dirname(os.path.abspath(__file__)), maven_tar, version, maven_dir], check=True)
             
-            # 환경 변수 설정
-            maven_profile = """
+            # 환경 변수 설정 (다시 실행해도 ~/.bashrc에 같은 블록이 중복으로 쌓이지 않도록 표시가 있으면 건너뜀)
+            maven_profile = f"""
+{BASHRC_MARKER}
 export M2_HOME=/opt/maven
 export PATH=$M2_HOME/bin:$PATH
 """
-            with open(os.path.expanduser("~/.bashrc"), "a") as f:
-                f.write(maven_profile)
-            
-            # 현재 세션에 환경 변수 적용
-            os.environ["M2_HOME"] = "/opt/maven"
-            os.environ["PATH"] = f"/opt/maven/bin:{os.environ['PATH']}"
+            # 몇십 바이트짜리 읽기/쓰기라 파이썬 파일 객체 없이 os.open/os.read/os.write로 바로 처리
+            bashrc = os.path.expanduser("~/.bashrc")
+            fd = os.open(bashrc, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                data = b""
+                while chunk := os.read(fd, 64 * 1024):
+                    data += chunk
+                if BASHRC_MARKER.encode() not in data:
+                    os.write(fd, maven_profile.encode())
+            finally:
+                os.close(fd)
             
-            # 설치 확인
+            # 설치 확인 (mvn -v는 JVM을 새로 띄우므로 기본적으로는 실행 파일만 확인)
             print("Maven 설치 확인 중...")
-            result = subprocess.run(["mvn", "-v"], capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"{self.RED}Maven 설치 확인 실패: {result.stderr}{self.NC}")
+            mvn_path = os.path.join(maven_dir, "bin", "mvn")
+            if not os.access(mvn_path, os.X_OK):
+                print(f"{RED}Maven 설치 확인 실패: {mvn_path}을(를) 실행할 수 없습니다.{NC}")
                 return False
+            if deep_verify:
+                result = subprocess.run([mvn_path, "-v"], capture_output=True, text=True)
+                if result.returncode != 0:
+                    print(f"{RED}Maven 설치 확인 실패: {result.stderr}{NC}")
+                    return False
                 
-            print(f"{self.GREEN}Maven 설치가 완료되었습니다.{self.NC}")
-            print("설치된 Maven 버전:")
-            print(result.stdout)
-            
-            # 임시 디렉토리 정리
-            shutil.rmtree(temp_dir)
+            self._current_version = version
+            print(f"{GREEN}Maven 설치가 완료되었습니다.{NC}")
+            print(f"설치된 Maven 버전: {version}")
             
             return True
             
         except Exception as e:
-            print(f"{self.RED}Maven 설치 중 오류가 발생했습니다: {e}{self.NC}")
+            print(f"{RED}Maven 설치 중 오류가 발생했습니다: {e}{NC}")
             return False
 
     def run(self):
@@ -96,12 +230,13 @@ export PATH=$M2_HOME/bin:$PATH
         current_version = self.check_current_version()
         if current_version:
             print(f"현재 Maven 버전: {current_version}")
-            major_version = int(current_version.split('.')[1])
-            if major_version >= 8:
-                print(f"{self.GREEN}Maven 버전이 이미 3.8 이상입니다.{self.NC}")
+            # "3.9.5", "4.0.0-rc-2", "3.9.5-SNAPSHOT" 등에서 (major, minor)만 비교
+            m = _VERSION_PREFIX_RE.match(current_version)
+            if m and (int(m.group(1)), int(m.group(2))) >= MIN_MAVEN_VERSION:
+                print(f"{GREEN}Maven 버전이 이미 3.8 이상입니다.{NC}")
                 return True
         
-        print(f"{self.YELLOW}Maven을 3.9.5 버전으로 업그레이드하시겠습니까? (y/n){self.NC}")
+        print(f"{YELLOW}Maven을 3.9.5 버전으로 업그레이드하시겠습니까? (y/n){NC}")
         response = input().strip().lower()
         if response == 'y':
             return self.install_maven()
@@ -113,11 +248,11 @@ def main():
     upgrader = MavenUpgrader()
     success = upgrader.run()
     if success:
-        print(f"{upgrader.GREEN}Maven 업그레이드가 완료되었습니다.{upgrader.NC}")
+        print(f"{GREEN}Maven 업그레이드가 완료되었습니다.{NC}")
         print("새로운 터미널을 열거나 다음 명령어를 실행하세요:")
         print("source ~/.bashrc")
     else:
-        print(f"{upgrader.RED}Maven 업그레이드에 실패했습니다.{upgrader.NC}")
+        print(f"{RED}Maven 업그레이드에 실패했습니다.{NC}")
         sys.exit(1)
 
 if __name__ == "__main__":